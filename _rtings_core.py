@@ -0,0 +1,132 @@
+"""Shared RTINGS.com table parsing and AutoEQ-style correction used by both extractor scripts."""
+import math
+import re
+from array import array
+from itertools import islice
+import numpy as np
+from lxml import etree
+
+GAIN_LIMIT = 32.0  # EQ gains are clamped to +/- this many dB
+_NUM_RE = re.compile(r"[^0-9.\-]", re.ASCII)
+_NON_NUMERIC = str.maketrans("", "", "".join(chr(c) for c in range(128) if chr(c) not in "0123456789.-"))
+
+def parse_rtings_html(html_file):
+    """
+    Streams the first table of an RTINGS.com HTML file.
+    Returns (headers, rows), where rows is an (N, 3) array of
+    (frequency, target, average response) sorted by frequency,
+    or None if the file has no table.
+    """
+    table = None
+    headers = []
+    # The streaming parser cannot know the row count up front, so rows go into
+    # one growable float64 buffer of (freq, target, avg) triples instead
+    buf = array("d")
+    for event, elem in _iter_parse_events(html_file):
+        if elem.tag == "table":
+            if event == "start" and table is None:
+                table = elem
+            elif elem is table:
+                break
+            continue
+        if event == "start" or table is None:
+            continue
+
+        # Collect column headers for reference
+        headers.extend("".join(th.itertext()).strip() for th in elem.findall("th"))
+
+        # Extract frequency, target, and average response data, stopping
+        # at the fourth cell; rows with fewer than 4 columns are skipped
+        cells = tuple(islice(elem.iterchildren("td"), 4))
+        if len(cells) == 4:
+            freq = clean_number(_cell_text(cells[0]))  # Frequency
+            target = clean_number(_cell_text(cells[1]))  # Harman Target
+            avg_response = clean_number(_cell_text(cells[3]))  # Average Response (raw data)
+
+            # Only keep valid numerical rows
+            if freq is not None and target is not None and avg_response is not None:
+                buf.append(freq)
+                buf.append(target)
+                buf.append(avg_response)
+
+        # Free the processed row (and any earlier siblings) as we go
+        elem.clear()
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+
+    if table is None:
+        return None
+
+    rows = np.frombuffer(buf, dtype=np.float64).reshape(-1, 3)  # Zero-copy (N, 3) view
+    # Sort by frequency; RTINGS tables are usually already in order, in which
+    # case the argsort and the gather copy are skipped entirely
+    freqs = rows[:, 0]
+    if np.any(freqs[1:] < freqs[:-1]):
+        rows = rows[np.argsort(freqs, kind="stable")]
+    return headers, rows
+
+def _iter_parse_events(html_file):
+    """Streams (event, element) pairs for the <table> and <tr> tags of the HTML file."""
+    try:
+        yield from etree.iterparse(
+            html_file, events=("start", "end"), tag=("table", "tr"),
+            html=True, recover=True, encoding="utf-8",
+        )
+    except etree.XMLSyntaxError:  # Empty document, so there is no table
+        return
+
+def _cell_text(cell):
+    """Returns the text of a table cell, only walking descendants when it has nested tags."""
+    if len(cell) == 0:  # No child elements, .text is the whole content
+        return cell.text or ""
+    return "".join(cell.itertext())
+
+def clean_number(value):
+    """Cleans the value and returns it as a float or None if invalid."""
+    if isinstance(value, (int, float)):  # Already a number
+        return float(value)
+    if not value or value.isspace():  # Empty values
+        return None
+    try:
+        num = float(value)  # Fast path: most cells are already clean numbers
+        if math.isfinite(num):
+            return num
+    except ValueError:
+        pass
+    if value.isascii():
+        num = value.translate(_NON_NUMERIC)  # Remove non-numeric characters
+    else:
+        num = _NUM_RE.sub("", value)  # The translate table only covers ASCII
+    try:
+        return float(num)
+    except ValueError:
+        return None  # Return None if conversion fails
+
+def apply_eq_correction(data):
+    """
+    Applies EQ correction based on the difference between the raw response and target curve.
+    Returns a two-column array of (frequency, gain) rows.
+    """
+    arr = np.asarray(data, dtype=np.float64)
+    eq_data = np.empty((len(arr), 2))
+    eq_data[:, 0] = arr[:, 0]
+    gains = eq_data[:, 1]
+
+    # Compute the required EQ gain (Harman Target - Raw Response) and
+    # clamp it to the range -32 to 32, writing straight into the output buffer
+    np.subtract(arr[:, 1], arr[:, 2], out=gains)
+    np.clip(gains, -GAIN_LIMIT, GAIN_LIMIT, out=gains)
+
+    return eq_data
+
+def save_graphic_eq(output_file, eq_data):
+    """Saves the corrected EQ data in GraphicEQ format."""
+    # Convert whole columns at once; .tolist() yields plain Python numbers,
+    # which format much faster than NumPy scalars
+    freqs = eq_data[:, 0].astype(np.int64).tolist()
+    gains = eq_data[:, 1].tolist()
+    with open(output_file, "w", encoding="utf-8") as file:
+        # Format output in the desired structure: GraphicEQ: 0 26.81; 54 26.82; ...
+        eq_string = "GraphicEQ: " + "; ".join(map("{0} {1:.2f}".format, freqs, gains))
+        file.write(eq_string)
+        file.write("\n")